@@ -0,0 +1,178 @@
+import os
+import re
+import json
+import gzip
+import hashlib
+import shutil
+
+# Необязательная зависимость: без brotli (или совместимого brotlicffi) собираются только .gz
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+from flask import request, send_from_directory, url_for, abort
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Файлы с отпечатком в имени не меняются, поэтому кэшируем их на год
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+ASSET_EXTENSIONS = ('.css', '.js')
+MIMETYPES = {
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+}
+
+
+def minify_css(source):
+    """Простая минификация CSS: комментарии, пробелы и лишние точки с запятой"""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    source = source.replace(';}', '}')
+    return source.strip()
+
+
+def minify_js(source):
+    """Консервативная минификация JS.
+
+    Удаляет отступы, пустые строки и строки целиком из // комментариев.
+    Переводы строк сохраняются, чтобы не ломать автоматическую расстановку точек с запятой.
+    """
+    lines = []
+    for line in source.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+def _iter_sources(static_dir, dist_dir):
+    """Возвращает логические имена (относительно static/) всех CSS/JS исходников"""
+    dist_dir = os.path.abspath(dist_dir)
+    for root, dirs, files in os.walk(static_dir):
+        # Не обрабатываем уже собранные файлы
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != dist_dir]
+        for filename in sorted(files):
+            if filename.endswith(ASSET_EXTENSIONS):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, static_dir).replace(os.sep, '/')
+
+
+def build_assets(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """Минифицирует, добавляет отпечаток и сжимает CSS/JS в static/dist.
+
+    Возвращает манифест: логическое имя -> имя файла с отпечатком.
+    """
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir)
+
+    manifest = {}
+    original_size = 0
+    built_size = 0
+
+    for name in _iter_sources(static_dir, dist_dir):
+        with open(os.path.join(static_dir, name), encoding='utf-8') as f:
+            source = f.read()
+
+        base, ext = os.path.splitext(name)
+        content = minify_css(source) if ext == '.css' else minify_js(source)
+        data = content.encode('utf-8')
+
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        fingerprinted = f'{base}.{digest}{ext}'
+        target = os.path.join(dist_dir, fingerprinted)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        with open(target, 'wb') as f:
+            f.write(data)
+        with open(target + '.gz', 'wb') as f:
+            # mtime=0, чтобы архив не менялся между сборками
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(target + '.br', 'wb') as f:
+                f.write(brotli.compress(data, quality=11))
+
+        manifest[name] = fingerprinted
+        original_size += len(source.encode('utf-8'))
+        built_size += len(data)
+        print(f"📦 {name} -> dist/{fingerprinted} ({len(data)} байт)")
+
+    with open(os.path.join(dist_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"✅ Собрано файлов: {len(manifest)}, {original_size} -> {built_size} байт")
+    if brotli is None:
+        print("⚠️ Модули brotli/brotlicffi не установлены, созданы только .gz версии")
+    return manifest
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Читает манифест сборки; пустой словарь, если сборка не выполнялась"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def init_app(app):
+    """Подключает к приложению asset_url() и раздачу собранных файлов"""
+    manifest = load_manifest()
+    if manifest:
+        print(f"📦 Манифест статики загружен: {len(manifest)} файлов")
+    else:
+        print("⚠️ Манифест статики не найден, файлы отдаются без сборки (python assets.py)")
+
+    def asset_url(name):
+        """URL файла с отпечатком, либо обычный static URL, если сборки нет"""
+        fingerprinted = manifest.get(name)
+        if fingerprinted is None:
+            return url_for('static', filename=name)
+        return url_for('dist_asset', filename=fingerprinted)
+
+    def dist_asset(filename):
+        """Отдает собранный файл, по возможности в предсжатом виде"""
+        ext = os.path.splitext(filename)[1]
+        if ext not in MIMETYPES:
+            abort(404)
+
+        served_name = filename
+        content_encoding = None
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            # Качество 0 (например, "br;q=0") означает явный отказ от кодировки
+            if request.accept_encodings[encoding] <= 0:
+                continue
+            if os.path.isfile(os.path.join(DIST_DIR, filename + suffix)):
+                served_name = filename + suffix
+                content_encoding = encoding
+                break
+
+        response = send_from_directory(DIST_DIR, served_name, mimetype=MIMETYPES[ext])
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    app.add_url_rule('/assets/<path:filename>', 'dist_asset', dist_asset)
+    app.jinja_env.globals['asset_url'] = asset_url
+    return asset_url
+
+
+# Сборка статики: python assets.py
+if __name__ == '__main__':
+    print("=" * 50)
+    print("Сборка статики...")
+    print("=" * 50)
+    build_assets()
@@ -1,13 +1,34 @@
 import os
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from config import Config
 import psycopg2
 from urllib.parse import urlparse
 import sqlite3
 import re  # Импортируем для работы с регулярными выражениями
+import threading
+import time
+from contextlib import contextmanager
+
+
+class DatabaseUnavailable(Exception):
+    """БД временно недоступна: автомат разомкнут после серии ошибок"""
+
+
+class DatabaseOverloaded(Exception):
+    """Запрос отклонен, потому что все слоты обращения к БД заняты"""
+
+
+class QueryDeadlineExceeded(TimeoutError):
+    """Истек срок выполнения запроса (statement_timeout / прерывание SQLite)"""
+
 
 class Database:
+    # Приоритеты запросов для ограничения нагрузки
+    PRIORITY_HIGH = 'high'
+    PRIORITY_LOW = 'low'
+    
+
     def __init__(self):
         # Получаем URL базы данных из переменной окружения или из Config
         self.database_url = os.environ.get('DATABASE_URL') or getattr(Config, 'DATABASE_URL', None)
@@ -42,22 +63,97 @@ class Database:
             print(f"SQLite path: {self.db_path}")
         print("=" * 50)
         
+        # Справочник пунктов выдачи/доставки в памяти: (city, location_type) -> [пункты]
+        # Загружается при старте и перечитывается после записи или по истечении TTL
+        # (TTL нужен, чтобы подхватывать изменения, сделанные другими воркерами)
+        self._location_directory = {}
+        self._location_directory_loaded_at = 0
+        # Пока справочник ни разу не загружен, пустой словарь — это отсутствие данных,
+        # а не отсутствие пунктов; повторные попытки загрузки идут с короткой паузой
+        self._location_directory_loaded = False
+        self._location_retry_at = 0
+        self.location_retry_backoff = 5
+        self._location_directory_lock = threading.Lock()
+        self._location_refresh_lock = threading.Lock()
+        self.location_directory_ttl = int(os.environ.get('LOCATION_DIRECTORY_TTL') or getattr(Config, 'LOCATION_DIRECTORY_TTL', 300))
+        
+        # Кэш идентификации пользователей по telegram_id: telegram_id -> (expires_at, поля)
+        # Короткий TTL, чтобы повторные запросы в рамках сессии не ходили в БД
+        self._user_cache = {}
+        self._user_cache_lock = threading.Lock()
+        self.user_cache_ttl = int(os.environ.get('USER_CACHE_TTL') or getattr(Config, 'USER_CACHE_TTL', 60))
+        self.user_cache_max_size = int(os.environ.get('USER_CACHE_MAX_SIZE') or getattr(Config, 'USER_CACHE_MAX_SIZE', 10000))
+        
+        # Обслуживание: секции заказов, архивирование и очистка брошенных корзин
+        self.order_partitions_ahead = int(os.environ.get('ORDER_PARTITIONS_AHEAD') or getattr(Config, 'ORDER_PARTITIONS_AHEAD', 2))
+        self.orders_retention_months = int(os.environ.get('ORDERS_RETENTION_MONTHS') or getattr(Config, 'ORDERS_RETENTION_MONTHS', 12))
+        self.cart_item_max_age_days = int(os.environ.get('CART_ITEM_MAX_AGE_DAYS') or getattr(Config, 'CART_ITEM_MAX_AGE_DAYS', 30))
+        self.cleanup_batch_size = int(os.environ.get('CLEANUP_BATCH_SIZE') or getattr(Config, 'CLEANUP_BATCH_SIZE', 1000))
+        self.maintenance_interval = int(os.environ.get('MAINTENANCE_INTERVAL') or getattr(Config, 'MAINTENANCE_INTERVAL', 3600))
+        self._maintenance_thread = None
+        
+        # Таймауты запросов: statement_timeout по умолчанию и сроки по приоритетам (секунды)
+        self.statement_timeout_ms = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS') or getattr(Config, 'DB_STATEMENT_TIMEOUT_MS', 15000))
+        self.connect_timeout = int(os.environ.get('DB_CONNECT_TIMEOUT') or getattr(Config, 'DB_CONNECT_TIMEOUT', 5))
+        self.priority_timeouts = {
+            self.PRIORITY_HIGH: float(os.environ.get('DB_HIGH_PRIORITY_TIMEOUT') or getattr(Config, 'DB_HIGH_PRIORITY_TIMEOUT', 10)),
+            self.PRIORITY_LOW: float(os.environ.get('DB_LOW_PRIORITY_TIMEOUT') or getattr(Config, 'DB_LOW_PRIORITY_TIMEOUT', 2)),
+        }
+        # Срок текущего запроса хранится в потоке, чтобы не передавать его через все методы
+        self._local = threading.local()
+        
+        # Автомат (circuit breaker) вокруг get_connection
+        self.breaker_failure_threshold = int(os.environ.get('DB_BREAKER_FAILURES') or getattr(Config, 'DB_BREAKER_FAILURES', 5))
+        self.breaker_reset_timeout = float(os.environ.get('DB_BREAKER_RESET_TIMEOUT') or getattr(Config, 'DB_BREAKER_RESET_TIMEOUT', 30))
+        self._breaker_lock = threading.Lock()
+        self._breaker_failures = 0
+        self._breaker_open_until = 0
+        
+        # Ограничение одновременных обращений к БД в процессе: низкоприоритетные
+        # запросы (лидерборд, рекомендуемые товары) получают только часть слотов
+        self.max_concurrent_queries = int(os.environ.get('DB_MAX_CONCURRENT') or getattr(Config, 'DB_MAX_CONCURRENT', 8))
+        self.low_priority_limit = max(1, int(self.max_concurrent_queries * float(os.environ.get('DB_LOW_PRIORITY_SHARE') or getattr(Config, 'DB_LOW_PRIORITY_SHARE', 0.5))))
+        self.admission_wait = float(os.environ.get('DB_ADMISSION_WAIT') or getattr(Config, 'DB_ADMISSION_WAIT', 1))
+        self._admission = threading.Condition()
+        self._in_flight = 0
+        
         # Инициализируем базу данных
         self.init_db()
+        
+        # Фоновое обслуживание (секции, архив, корзины); MAINTENANCE_INTERVAL=0 отключает его,
+        # например если run_maintenance запускается внешним планировщиком
+        if self.maintenance_interval > 0:
+            self.start_maintenance_scheduler()
     
     def get_connection(self):
         """Возвращает соединение с базой данных"""
         if self.is_postgres and self.database_url:
             # PostgreSQL для Render
+            # При разомкнутом автомате сразу отказываем, не дожидаясь таймаута подключения
+            self._check_circuit()
+            connect_timeout = self._connect_timeout()
+            started = time.monotonic()
             try:
                 print(f"🔗 Подключаемся к PostgreSQL...")
                 
-                # Упрощенное подключение для psycopg2
-                conn = psycopg2.connect(self.database_url, sslmode='require')
+                # statement_timeout по умолчанию задается на всё соединение
+                conn = psycopg2.connect(
+                    self.database_url,
+                    sslmode='require',
+                    connect_timeout=connect_timeout,
+                    options=f'-c statement_timeout={self.statement_timeout_ms}'
+                )
+                self._record_success()
                 
                 print("✅ Успешное подключение к PostgreSQL")
                 return conn
             except Exception as e:
+                # Таймаут, урезанный сроком вызывающего (например, 2 с для лидерборда),
+                # не говорит о недоступности БД и не учитывается автоматом
+                if connect_timeout < self.connect_timeout and time.monotonic() - started >= connect_timeout:
+                    print(f"⏱️ Подключение к PostgreSQL не уложилось в срок запроса ({connect_timeout} с)")
+                    raise QueryDeadlineExceeded(f"Срок запроса истек при подключении к PostgreSQL: {e}") from e
+                self._record_failure()
                 print(f"❌ Ошибка подключения к PostgreSQL: {e}")
                 import traceback
                 traceback.print_exc()
@@ -72,7 +168,8 @@ class Database:
                     print(f"⚠️ Обнаружен PostgreSQL URL в пути SQLite, используем database.db")
                     db_path = 'database.db'
                 
-                conn = sqlite3.connect(db_path)
+                # timeout — сколько ждать снятия блокировки другим процессом
+                conn = sqlite3.connect(db_path, timeout=self._connect_timeout(self.statement_timeout_ms / 1000))
                 print(f"✅ Успешное подключение к SQLite: {db_path}")
                 return conn
             except Exception as e:
@@ -133,10 +230,43 @@ class Database:
         if params:
             print(f"📊 Params: {params[:5]}{'...' if len(params) > 5 else ''}")
         
+        # Срок выполнения: передаем его в statement_timeout / обработчик прогресса SQLite
+        remaining_ms = self._remaining_ms()
+        if remaining_ms is not None and remaining_ms <= 0:
+            raise QueryDeadlineExceeded("Срок выполнения истек до отправки запроса")
+        
+        sqlite_conn = None
+        pg_previous_timeout = None
+        if remaining_ms is not None:
+            if self.is_postgres:
+                # Отдельный курсор, чтобы не затереть результат основного запроса
+                with cursor.connection.cursor() as timeout_cursor:
+                    timeout_cursor.execute(
+                        "SELECT current_setting('statement_timeout'), set_config('statement_timeout', %s, true)",
+                        (str(remaining_ms),)
+                    )
+                    pg_previous_timeout = timeout_cursor.fetchone()[0]
+            else:
+                sqlite_conn = cursor.connection
+                deadline = self._local.deadline
+                sqlite_conn.execute(f'PRAGMA busy_timeout = {remaining_ms}')
+                sqlite_conn.set_progress_handler(lambda: int(time.monotonic() > deadline), 1000)
+        
         try:
             cursor.execute(query, params)
+            if pg_previous_timeout is not None:
+                # Возвращаем прежний statement_timeout: SET LOCAL действует до конца транзакции,
+                # и следующие запросы вне блока deadline() не должны получить укороченный таймаут
+                with cursor.connection.cursor() as timeout_cursor:
+                    timeout_cursor.execute("SELECT set_config('statement_timeout', %s, true)",
+                                           (pg_previous_timeout,))
             return True
         except Exception as e:
+            # В QueryDeadlineExceeded превращаем только ошибки запросов, для которых задан срок
+            if remaining_ms is not None and self._is_timeout_error(e):
+                print(f"⏱️ SQL Timeout: {str(e)[:200]}")
+                print(f"⏱️ Query: {query_for_log}")
+                raise QueryDeadlineExceeded(f"Запрос не уложился в срок: {e}") from e
             print(f"❌ SQL Error: {str(e)[:200]}")
             print(f"❌ Full Query: {query}")
             print(f"❌ Params: {params}")
@@ -144,6 +274,134 @@ class Database:
             import traceback
             traceback.print_exc()
             raise
+        finally:
+            if sqlite_conn is not None:
+                sqlite_conn.set_progress_handler(None, 0)
+                sqlite_conn.execute(f'PRAGMA busy_timeout = {self.statement_timeout_ms}')
+    
+    def _disable_statement_timeout(self, cursor):
+        """Отключает statement_timeout на соединении (схема, миграции, обслуживание).
+        
+        Используется SET без LOCAL, чтобы настройка пережила промежуточные коммиты.
+        """
+        if self.is_postgres:
+            cursor.execute('SET statement_timeout = 0')
+    
+    # ==================== Сроки, автомат и ограничение нагрузки ====================
+    
+    @contextmanager
+    def deadline(self, timeout):
+        """Задает срок (в секундах) для всех запросов внутри блока в текущем потоке.
+        
+        Вложенный блок не может продлить срок внешнего.
+        """
+        previous = getattr(self._local, 'deadline', None)
+        current = time.monotonic() + timeout if timeout is not None else None
+        if previous is not None and (current is None or previous < current):
+            current = previous
+        
+        self._local.deadline = current
+        try:
+            yield current
+        finally:
+            self._local.deadline = previous
+    
+    @contextmanager
+    def admit(self, priority=PRIORITY_HIGH, timeout=None):
+        """Допускает запрос к БД с учетом приоритета и задает ему срок.
+        
+        Низкоприоритетные запросы при нехватке слотов отклоняются сразу,
+        высокоприоритетные ждут свободный слот не дольше admission_wait.
+        При отказе выбрасывается DatabaseOverloaded.
+        """
+        if priority == self.PRIORITY_LOW:
+            limit = self.low_priority_limit
+        else:
+            limit = self.max_concurrent_queries
+        
+        with self._admission:
+            if priority == self.PRIORITY_LOW:
+                if self._in_flight >= limit or self._circuit_is_open():
+                    raise DatabaseOverloaded("БД перегружена, низкоприоритетный запрос отклонен")
+            else:
+                wait_until = time.monotonic() + self.admission_wait
+                while self._in_flight >= limit:
+                    remaining = wait_until - time.monotonic()
+                    if remaining <= 0:
+                        raise DatabaseOverloaded("БД перегружена, нет свободных слотов")
+                    self._admission.wait(remaining)
+            self._in_flight += 1
+        
+        try:
+            if timeout is None:
+                timeout = self.priority_timeouts.get(priority)
+            with self.deadline(timeout):
+                yield
+        finally:
+            with self._admission:
+                self._in_flight -= 1
+                self._admission.notify()
+    
+    def _remaining_ms(self):
+        """Оставшееся до срока время в миллисекундах или None, если срока нет"""
+        deadline = getattr(self._local, 'deadline', None)
+        if deadline is None:
+            return None
+        return max(0, int((deadline - time.monotonic()) * 1000))
+    
+    def _connect_timeout(self, default=None):
+        """Таймаут подключения с учетом срока текущего запроса (секунды)"""
+        timeout = self.connect_timeout if default is None else default
+        remaining_ms = self._remaining_ms()
+        if remaining_ms is not None:
+            # connect_timeout в PostgreSQL — целое число секунд, не меньше 1
+            timeout = min(timeout, max(1, remaining_ms // 1000))
+        return timeout
+    
+    def _is_timeout_error(self, error):
+        """Проверяет, что ошибка вызвана таймаутом или прерыванием запроса"""
+        if self.is_postgres:
+            # 57014 — query_canceled (в том числе по statement_timeout)
+            return getattr(error, 'pgcode', None) == '57014'
+        if isinstance(error, sqlite3.OperationalError):
+            message = str(error).lower()
+            return 'interrupted' in message or 'database is locked' in message
+        return False
+    
+    def _circuit_is_open(self):
+        """Автомат разомкнут и пробный запрос еще не разрешен"""
+        return self._breaker_open_until > time.monotonic()
+    
+    def _check_circuit(self):
+        """Отказывает сразу, если автомат разомкнут; после паузы пропускает один пробный запрос"""
+        with self._breaker_lock:
+            if not self._breaker_open_until:
+                return
+            now = time.monotonic()
+            if now < self._breaker_open_until:
+                raise DatabaseUnavailable("БД временно недоступна, повторите запрос позже")
+            # Полуоткрытое состояние: пропускаем один запрос, остальные ждут его результата
+            self._breaker_open_until = now + self.breaker_reset_timeout
+    
+    def _record_failure(self):
+        """Учитывает ошибку подключения; при превышении порога размыкает автомат.
+        
+        Таймауты запросов сюда не попадают: их причиной часто бывает собственный
+        срок вызывающего (например, 2 с для лидерборда), а не недоступность БД.
+        """
+        with self._breaker_lock:
+            self._breaker_failures += 1
+            if self._breaker_failures >= self.breaker_failure_threshold:
+                self._breaker_open_until = time.monotonic() + self.breaker_reset_timeout
+                print(f"🔌 Автомат БД разомкнут на {self.breaker_reset_timeout} с после {self._breaker_failures} ошибок")
+    
+    def _record_success(self):
+        """Сбрасывает счетчик ошибок и замыкает автомат"""
+        with self._breaker_lock:
+            if self._breaker_open_until:
+                print("🔌 Автомат БД замкнут")
+            self._breaker_failures = 0
+            self._breaker_open_until = 0
     
     def fetchone(self, cursor):
         """Универсальный метод получения одной строки"""
@@ -161,6 +419,13 @@ class Database:
         else:
             return cursor.lastrowid
     
+    def row_to_dict(self, cursor, row):
+        """Преобразует строку результата в словарь по именам колонок"""
+        if row is None:
+            return None
+        columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, row))
+    
     def bool_to_sql(self, value):
         """Конвертирует булево значение в SQL формат"""
         if self.is_postgres:
@@ -183,6 +448,9 @@ class Database:
         cursor = conn.cursor()
         
         try:
+            # Миграции и создание индексов не должны прерываться по statement_timeout
+            self._disable_statement_timeout(cursor)
+            
             # Создаем таблицы с учетом типа БД
             print("Создание таблиц...")
             self._create_tables(cursor)
@@ -194,6 +462,9 @@ class Database:
             conn.commit()
             print("База данных успешно инициализирована!")
             
+            # Загружаем справочник пунктов выдачи в память
+            self._load_location_directory(cursor)
+            
         except Exception as e:
             conn.rollback()
             print(f"Ошибка инициализации БД: {e}")
@@ -207,6 +478,10 @@ class Database:
         """Создание таблиц"""
         
         if self.is_postgres:
+            # Воркеры стартуют одновременно: схему (и миграцию orders) меняет только один,
+            # остальные ждут до конца его транзакции и видят уже готовую схему
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', (self.SCHEMA_LOCK_ID,))
+            
             # PostgreSQL схемы
             # Пользователи
             cursor.execute('''
@@ -266,29 +541,47 @@ class Database:
                     specifications TEXT,
                     category VARCHAR(255) DEFAULT 'pods',
                     is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    row_version INTEGER DEFAULT 0
                 )
             ''')
             print("Таблица 'products' проверена/создана")
             
-            # Заказы
+            # Версия строки товара: увеличивается при каждом UPDATE,
+            # используется как ключ кэша отрисованных шаблонов
+            # Колонку и триггер создаем только если их нет: ALTER/DROP TRIGGER берут
+            # эксклюзивную блокировку products при каждом старте воркера
             cursor.execute('''
-                CREATE TABLE IF NOT EXISTS orders (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER,
-                    total_amount DECIMAL(10, 2),
-                    cashback_earned DECIMAL(10, 2),
-                    customer_name VARCHAR(255),
-                    customer_phone VARCHAR(50),
-                    pickup_location TEXT,
-                    delivery_type VARCHAR(50) DEFAULT 'pickup',
-                    delivery_city VARCHAR(100),
-                    delivery_address TEXT,
-                    delivery_price DECIMAL(10, 2) DEFAULT 0,
-                    status VARCHAR(50) DEFAULT 'pending',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'products' AND column_name = 'row_version'
+            ''')
+            if cursor.fetchone() is None:
+                cursor.execute('ALTER TABLE products ADD COLUMN row_version INTEGER DEFAULT 0')
+                print("Колонка 'row_version' добавлена в таблицу 'products'")
+            
+            cursor.execute('''
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'trg_products_row_version' AND tgrelid = 'products'::regclass
             ''')
+            if cursor.fetchone() is None:
+                cursor.execute('''
+                    CREATE OR REPLACE FUNCTION bump_products_row_version() RETURNS trigger AS $$
+                    BEGIN
+                        NEW.row_version := COALESCE(OLD.row_version, 0) + 1;
+                        RETURN NEW;
+                    END;
+                    $$ LANGUAGE plpgsql
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER trg_products_row_version
+                    BEFORE UPDATE ON products
+                    FOR EACH ROW EXECUTE PROCEDURE bump_products_row_version()
+                ''')
+                print("Триггер 'trg_products_row_version' создан")
+            
+            # Заказы (секционированы по месяцам на created_at)
+            self._create_orders_table_postgres(cursor)
+            self._ensure_order_partitions(cursor)
             print("Таблица 'orders' проверена/создана")
             
             # Пункты выдачи
@@ -338,9 +631,11 @@ class Database:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_active ON products(is_active)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_cart_items_user ON cart_items(user_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_cart_items_created ON cart_items(created_at)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_referral_bonuses_referrer ON referral_bonuses(referrer_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_referral_bonuses_referred ON referral_bonuses(referred_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_pickup_locations_city_type ON pickup_locations(city, location_type, is_active)')
                 print("Индексы проверены/созданы")
             except Exception as e:
                 print(f"Ошибка создания индексов (можно игнорировать): {e}")
@@ -439,11 +734,32 @@ class Database:
                     specifications TEXT,
                     category TEXT DEFAULT 'pods',
                     is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    row_version INTEGER DEFAULT 0
                 )
             ''')
             print("Таблица 'products' проверена/создана")
             
+            # Версия строки товара для кэша отрисованных шаблонов
+            try:
+                cursor.execute("PRAGMA table_info(products)")
+                product_columns = [column[1] for column in cursor.fetchall()]
+                
+                if 'row_version' not in product_columns:
+                    cursor.execute('ALTER TABLE products ADD COLUMN row_version INTEGER DEFAULT 0')
+                    print("Колонка 'row_version' добавлена в таблицу 'products'")
+            except:
+                pass
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS trg_products_row_version
+                AFTER UPDATE ON products
+                FOR EACH ROW WHEN NEW.row_version IS OLD.row_version
+                BEGIN
+                    UPDATE products SET row_version = COALESCE(OLD.row_version, 0) + 1 WHERE id = NEW.id;
+                END
+            ''')
+            
             # Заказы
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS orders (
@@ -484,6 +800,27 @@ class Database:
             except:
                 pass
             
+            # Архив заказов (аналог отсоединенных секций PostgreSQL)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS orders_archive (
+                    id INTEGER PRIMARY KEY,
+                    user_id INTEGER,
+                    total_amount REAL,
+                    cashback_earned REAL,
+                    customer_name TEXT,
+                    customer_phone TEXT,
+                    pickup_location TEXT,
+                    delivery_type TEXT DEFAULT 'pickup',
+                    delivery_city TEXT,
+                    delivery_address TEXT,
+                    delivery_price REAL DEFAULT 0,
+                    status TEXT DEFAULT 'pending',
+                    created_at TIMESTAMP,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            print("Таблица 'orders_archive' проверена/создана")
+            
             # Пункты выдачи
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS pickup_locations (
@@ -553,9 +890,13 @@ class Database:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_active ON products(is_active)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_cart_items_user ON cart_items(user_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_cart_items_created ON cart_items(created_at)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_created ON orders(created_at)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_archive_user ON orders_archive(user_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_referral_bonuses_referrer ON referral_bonuses(referrer_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_referral_bonuses_referred ON referral_bonuses(referred_id)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_pickup_locations_city_type ON pickup_locations(city, location_type, is_active)')
                 print("Индексы проверены/созданы")
             except Exception as e:
                 print(f"Ошибка создания индексов: {e}")
@@ -732,6 +1073,617 @@ class Database:
             import traceback
             traceback.print_exc()
 
+    # ==================== Секционирование и архив заказов ====================
+
+    # Колонки заказов (используются при переносе в архив SQLite)
+    ORDER_COLUMNS = (
+        'id, user_id, total_amount, cashback_earned, customer_name, customer_phone, '
+        'pickup_location, delivery_type, delivery_city, delivery_address, delivery_price, '
+        'status, created_at'
+    )
+
+    # Ключи advisory-блокировок: обслуживание выполняет только один воркер,
+    # изменения схемы (миграция, создание секций) не выполняются параллельно
+    MAINTENANCE_LOCK_ID = 7_302_028
+    SCHEMA_LOCK_ID = 7_302_029
+
+    @staticmethod
+    def _month_start(value, offset=0):
+        """Возвращает начало месяца, сдвинутого на offset месяцев от value"""
+        month_index = value.year * 12 + value.month - 1 + offset
+        return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+    def _create_orders_table_postgres(self, cursor, id_column='id SERIAL'):
+        """Создает секционированную таблицу orders или переводит на нее существующую"""
+        cursor.execute('''
+            SELECT c.relkind FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = 'orders' AND n.nspname = current_schema()
+        ''')
+        row = cursor.fetchone()
+        relkind = row[0] if row else None
+
+        if relkind == 'p':
+            # Уже секционирована
+            return
+
+        if relkind is not None:
+            # Обычная таблица из прежней схемы: переименовываем ее и подключаем
+            # как секцию со всеми заказами до начала следующего месяца
+            print("Перевод таблицы 'orders' на секционирование по месяцам...")
+            cursor.execute('ALTER TABLE orders RENAME TO orders_legacy')
+            # Первичный ключ секции задает родительская таблица (id, created_at),
+            # собственный ключ по id не позволит подключить таблицу как секцию
+            cursor.execute('ALTER TABLE orders_legacy DROP CONSTRAINT IF EXISTS orders_pkey')
+            cursor.execute('ALTER INDEX IF EXISTS idx_orders_user RENAME TO idx_orders_legacy_user')
+            cursor.execute('UPDATE orders_legacy SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL')
+            cursor.execute('ALTER TABLE orders_legacy ALTER COLUMN created_at SET NOT NULL')
+            cursor.execute('ALTER SEQUENCE orders_id_seq OWNED BY NONE')
+            id_column = "id INTEGER NOT NULL DEFAULT nextval('orders_id_seq')"
+
+        cursor.execute(f'''
+            CREATE TABLE orders (
+                {id_column},
+                user_id INTEGER,
+                total_amount DECIMAL(10, 2),
+                cashback_earned DECIMAL(10, 2),
+                customer_name VARCHAR(255),
+                customer_phone VARCHAR(50),
+                pickup_location TEXT,
+                delivery_type VARCHAR(50) DEFAULT 'pickup',
+                delivery_city VARCHAR(100),
+                delivery_address TEXT,
+                delivery_price DECIMAL(10, 2) DEFAULT 0,
+                status VARCHAR(50) DEFAULT 'pending',
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        ''')
+
+        if relkind is not None:
+            legacy_end = self._month_start(datetime.now(), 1)
+            cursor.execute('ALTER SEQUENCE orders_id_seq OWNED BY orders.id')
+            cursor.execute(f"ALTER TABLE orders ATTACH PARTITION orders_legacy FOR VALUES FROM (MINVALUE) TO ('{legacy_end:%Y-%m-%d}')")
+            # Индекс для пакетного переноса старых заказов в архив (archive_old_orders)
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_orders_legacy_created ON orders_legacy(created_at)')
+            print(f"Таблица 'orders_legacy' подключена как секция до {legacy_end:%Y-%m-%d}")
+
+    def _ensure_order_partitions(self, cursor, months_ahead=None):
+        """Создает месячные секции orders на текущий и следующие месяцы (только PostgreSQL).
+
+        Секция orders_default принимает заказы, для месяца которых секции еще нет,
+        поэтому пропущенный запуск обслуживания не ломает оформление заказов.
+        """
+        if not self.is_postgres:
+            return
+
+        if months_ahead is None:
+            months_ahead = self.order_partitions_ahead
+
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', (self.SCHEMA_LOCK_ID,))
+        cursor.execute('CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT')
+
+        now = datetime.now()
+        for offset in range(months_ahead + 1):
+            start = self._month_start(now, offset)
+            end = self._month_start(now, offset + 1)
+            name = f'orders_p{start:%Y%m}'
+            bounds = f"FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+
+            cursor.execute('SELECT to_regclass(%s)', (name,))
+            if cursor.fetchone()[0] is not None:
+                continue
+
+            cursor.execute('SAVEPOINT order_partition')
+            try:
+                cursor.execute('SELECT EXISTS (SELECT 1 FROM orders_default WHERE created_at >= %s AND created_at < %s)',
+                               (start, end))
+                if cursor.fetchone()[0]:
+                    # В orders_default уже есть заказы этого месяца: переносим их в новую секцию
+                    cursor.execute('ALTER TABLE orders DETACH PARTITION orders_default')
+                    cursor.execute(f'CREATE TABLE {name} PARTITION OF orders FOR VALUES {bounds}')
+                    cursor.execute(f'''
+                        WITH moved AS (
+                            DELETE FROM orders_default WHERE created_at >= %s AND created_at < %s
+                            RETURNING {self.ORDER_COLUMNS}
+                        )
+                        INSERT INTO orders ({self.ORDER_COLUMNS}) SELECT {self.ORDER_COLUMNS} FROM moved
+                    ''', (start, end))
+                    cursor.execute('ALTER TABLE orders ATTACH PARTITION orders_default DEFAULT')
+                else:
+                    cursor.execute(f'CREATE TABLE {name} PARTITION OF orders FOR VALUES {bounds}')
+                cursor.execute('RELEASE SAVEPOINT order_partition')
+                print(f"Секция '{name}' создана")
+            except Exception as e:
+                # Диапазон уже покрыт другой секцией (например, orders_legacy после миграции)
+                cursor.execute('ROLLBACK TO SAVEPOINT order_partition')
+                print(f"Секция '{name}' пропущена: {e}")
+
+    def _move_orders_to_archive_postgres(self, conn, cursor, source, target, cutoff, batch_size):
+        """Пачками переносит заказы старше cutoff из секции source в таблицу target"""
+        cursor.execute(f'CREATE TABLE IF NOT EXISTS {target} (LIKE {source})')
+        conn.commit()
+
+        moved = 0
+        while True:
+            self.execute_query(cursor, f'''
+                WITH moved AS (
+                    DELETE FROM {source} WHERE ctid = ANY(ARRAY(
+                        SELECT ctid FROM {source} WHERE created_at < ? LIMIT ?
+                    ))
+                    RETURNING {self.ORDER_COLUMNS}
+                )
+                INSERT INTO {target} ({self.ORDER_COLUMNS}) SELECT {self.ORDER_COLUMNS} FROM moved
+            ''', (cutoff, batch_size))
+            batch_moved = cursor.rowcount
+            conn.commit()
+            moved += batch_moved
+            if batch_moved < batch_size:
+                break
+
+        if moved:
+            print(f"Из '{source}' перенесено в '{target}': {moved}")
+        return moved
+
+    def _retire_legacy_partition(self, conn, cursor, cutoff):
+        """Отсоединяет и удаляет пустую orders_legacy, когда весь ее диапазон старше cutoff"""
+        cursor.execute('''
+            SELECT pg_get_expr(c.relpartbound, c.oid) FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = 'orders_legacy' AND n.nspname = current_schema() AND c.relispartition
+        ''')
+        row = cursor.fetchone()
+        if not row:
+            return
+
+        match = re.search(r"TO \('([^']+)'\)", row[0] or '')
+        if not match or datetime.fromisoformat(match.group(1)) > cutoff:
+            return
+
+        cursor.execute('SELECT EXISTS (SELECT 1 FROM orders_legacy)')
+        if cursor.fetchone()[0]:
+            return
+
+        cursor.execute('ALTER TABLE orders DETACH PARTITION orders_legacy')
+        cursor.execute('DROP TABLE orders_legacy')
+        conn.commit()
+        print("Пустая секция 'orders_legacy' удалена (заказы перенесены в orders_archive_legacy)")
+
+    def archive_old_orders(self, months_to_keep=None, batch_size=None):
+        """Убирает из orders заказы старше months_to_keep месяцев.
+
+        PostgreSQL: месячные секции отсоединяются и переименовываются в orders_archive_pYYYYMM;
+        заказы из orders_legacy и orders_default пачками переносятся в orders_archive_legacy
+        и orders_archive_default, опустевшая orders_legacy удаляется.
+        SQLite: заказы пачками переносятся в таблицу orders_archive.
+        Возвращает количество перенесенных в архив заказов.
+        """
+        if months_to_keep is None:
+            months_to_keep = self.orders_retention_months
+        if batch_size is None:
+            batch_size = self.cleanup_batch_size
+
+        cutoff = self._month_start(datetime.now(), -months_to_keep)
+        archived = 0
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            self._disable_statement_timeout(cursor)
+            if self.is_postgres:
+                cursor.execute('''
+                    SELECT c.relname FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    JOIN pg_class p ON p.oid = i.inhparent
+                    WHERE p.relname = 'orders' AND c.relname ~ '^orders_p[0-9]{6}$'
+                    ORDER BY c.relname
+                ''')
+                for (name,) in cursor.fetchall():
+                    start = datetime.strptime(name[len('orders_p'):], '%Y%m')
+                    if self._month_start(start, 1) > cutoff:
+                        continue
+                    cursor.execute(f'SELECT COUNT(*) FROM {name}')
+                    rows = cursor.fetchone()[0]
+                    # DETACH не перемещает данные, блокировка держится недолго
+                    cursor.execute(f'ALTER TABLE orders DETACH PARTITION {name}')
+                    cursor.execute(f'ALTER TABLE {name} RENAME TO orders_archive_p{start:%Y%m}')
+                    conn.commit()
+                    archived += rows
+                    print(f"Секция '{name}' отсоединена в архив")
+
+                # Секции без месячного диапазона: заказы до миграции и попавшие в DEFAULT
+                cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+                for source, target in (('orders_legacy', 'orders_archive_legacy'),
+                                       ('orders_default', 'orders_archive_default')):
+                    cursor.execute('SELECT to_regclass(%s)', (source,))
+                    if cursor.fetchone()[0] is None:
+                        continue
+                    archived += self._move_orders_to_archive_postgres(conn, cursor, source, target,
+                                                                      cutoff_str, batch_size)
+                self._retire_legacy_partition(conn, cursor, cutoff)
+            else:
+                cutoff_str = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+                while True:
+                    self.execute_query(cursor, 'SELECT id FROM orders WHERE created_at < ? ORDER BY id LIMIT ?',
+                                       (cutoff_str, batch_size))
+                    ids = [row[0] for row in self.fetchall(cursor)]
+                    if not ids:
+                        break
+
+                    placeholders = ', '.join('?' for _ in ids)
+                    self.execute_query(cursor, f'''
+                        INSERT OR REPLACE INTO orders_archive ({self.ORDER_COLUMNS})
+                        SELECT {self.ORDER_COLUMNS} FROM orders WHERE id IN ({placeholders})
+                    ''', ids)
+                    self.execute_query(cursor, f'DELETE FROM orders WHERE id IN ({placeholders})', ids)
+                    conn.commit()
+                    archived += len(ids)
+
+                if archived:
+                    print(f"Перенесено в архив заказов: {archived}")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        return archived
+
+    def prune_stale_cart_items(self, max_age_days=None, batch_size=None):
+        """Удаляет товары из брошенных корзин пачками, коммитя после каждой пачки"""
+        if max_age_days is None:
+            max_age_days = self.cart_item_max_age_days
+        if batch_size is None:
+            batch_size = self.cleanup_batch_size
+
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+        deleted = 0
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            self._disable_statement_timeout(cursor)
+            while True:
+                self.execute_query(cursor, '''
+                    DELETE FROM cart_items WHERE id IN (
+                        SELECT id FROM cart_items WHERE created_at < ? ORDER BY id LIMIT ?
+                    )
+                ''', (cutoff, batch_size))
+                batch_deleted = cursor.rowcount
+                conn.commit()
+                deleted += batch_deleted
+                if batch_deleted < batch_size:
+                    break
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        if deleted:
+            print(f"Удалено устаревших товаров из корзин: {deleted}")
+        return deleted
+
+    def run_maintenance(self):
+        """Плановое обслуживание: секции заказов, архивирование и очистка корзин"""
+        lock_conn = None
+        try:
+            if self.is_postgres:
+                lock_conn = self.get_connection()
+                lock_cursor = lock_conn.cursor()
+                lock_cursor.execute('SELECT pg_try_advisory_lock(%s)', (self.MAINTENANCE_LOCK_ID,))
+                if not lock_cursor.fetchone()[0]:
+                    print("Обслуживание уже выполняется другим процессом, пропускаем")
+                    return
+                self._disable_statement_timeout(lock_cursor)
+                self._ensure_order_partitions(lock_cursor)
+                lock_conn.commit()
+
+            self.archive_old_orders()
+            self.prune_stale_cart_items()
+        except Exception as e:
+            print(f"❌ Ошибка обслуживания БД: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            if lock_conn is not None:
+                try:
+                    lock_conn.cursor().execute('SELECT pg_advisory_unlock(%s)', (self.MAINTENANCE_LOCK_ID,))
+                except Exception:
+                    pass
+                lock_conn.close()
+
+    def start_maintenance_scheduler(self, interval=None):
+        """Запускает фоновый поток, периодически вызывающий run_maintenance"""
+        if self._maintenance_thread is not None and self._maintenance_thread.is_alive():
+            return self._maintenance_thread
+
+        if interval is None:
+            interval = self.maintenance_interval
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.run_maintenance()
+
+        self._maintenance_thread = threading.Thread(target=loop, name='db-maintenance', daemon=True)
+        self._maintenance_thread.start()
+        print(f"Фоновое обслуживание БД запущено (интервал {interval} с)")
+        return self._maintenance_thread
+
+    # ==================== Пользователи Telegram ====================
+
+    # Поля, которые можно кэшировать: финансовые данные и верификация всегда читаются из БД
+    USER_IDENTITY_FIELDS = ('id', 'telegram_id', 'username', 'first_name', 'photo_url')
+
+    def upsert_telegram_user(self, telegram_id, username=None, first_name=None, photo_url=None):
+        """Создает или обновляет пользователя одним запросом и возвращает его запись"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            # Обновляем только если данные действительно изменились,
+            # чтобы не плодить лишние версии строк при каждом входе
+            upsert_query = '''
+                INSERT INTO users (telegram_id, username, first_name, photo_url)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (telegram_id) DO UPDATE SET
+                    username = excluded.username,
+                    first_name = excluded.first_name,
+                    photo_url = excluded.photo_url
+                WHERE users.username IS DISTINCT FROM excluded.username
+                   OR users.first_name IS DISTINCT FROM excluded.first_name
+                   OR users.photo_url IS DISTINCT FROM excluded.photo_url
+            '''
+            if not self.is_postgres:
+                # В SQLite аналог IS DISTINCT FROM — оператор IS NOT
+                upsert_query = upsert_query.replace('IS DISTINCT FROM', 'IS NOT')
+
+            params = (telegram_id, username, first_name, photo_url)
+            supports_returning = self.is_postgres or sqlite3.sqlite_version_info >= (3, 35, 0)
+
+            user = None
+            if supports_returning:
+                self.execute_query(cursor, upsert_query + ' RETURNING *', params)
+                user = self.row_to_dict(cursor, self.fetchone(cursor))
+            else:
+                self.execute_query(cursor, upsert_query, params)
+
+            if user is None:
+                # Данные не изменились (RETURNING пуст) или нет поддержки RETURNING
+                self.execute_query(cursor, 'SELECT * FROM users WHERE telegram_id = ?', (telegram_id,))
+                user = self.row_to_dict(cursor, self.fetchone(cursor))
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        self._cache_user(telegram_id, user)
+        return user
+
+    def get_user_identity(self, telegram_id):
+        """Возвращает идентификационные поля пользователя по telegram_id, используя кэш.
+
+        Баланс, суммы и статус верификации сюда не входят: их нужно читать
+        из БД через get_user_by_telegram_id.
+        """
+        with self._user_cache_lock:
+            cached = self._user_cache.get(telegram_id)
+        if cached and cached[0] > time.time():
+            return dict(cached[1])
+
+        user = self.get_user_by_telegram_id(telegram_id)
+        if user is None:
+            return None
+        return {field: user.get(field) for field in self.USER_IDENTITY_FIELDS}
+
+    def get_user_by_telegram_id(self, telegram_id):
+        """Возвращает полную запись пользователя из БД (в т.ч. баланс и статус верификации)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            self.execute_query(cursor, 'SELECT * FROM users WHERE telegram_id = ?', (telegram_id,))
+            user = self.row_to_dict(cursor, self.fetchone(cursor))
+        finally:
+            cursor.close()
+            conn.close()
+
+        self._cache_user(telegram_id, user)
+        return user
+
+    def _cache_user(self, telegram_id, user):
+        """Кладет идентификационные поля пользователя в кэш, вычищая устаревшие записи при переполнении"""
+        if user is None or self.user_cache_ttl <= 0:
+            return
+        identity = {field: user.get(field) for field in self.USER_IDENTITY_FIELDS}
+        now = time.time()
+        with self._user_cache_lock:
+            if len(self._user_cache) >= self.user_cache_max_size:
+                self._user_cache = {
+                    key: value for key, value in self._user_cache.items() if value[0] > now
+                }
+                if len(self._user_cache) >= self.user_cache_max_size:
+                    self._user_cache.clear()
+            self._user_cache[telegram_id] = (now + self.user_cache_ttl, identity)
+
+    def invalidate_user_cache(self, telegram_id=None):
+        """Сбрасывает кэш пользователя (или весь кэш) после смены имени, фото и т.п."""
+        with self._user_cache_lock:
+            if telegram_id is None:
+                self._user_cache.clear()
+            else:
+                self._user_cache.pop(telegram_id, None)
+
+    # ==================== Справочник пунктов выдачи ====================
+
+    def _load_location_directory(self, cursor):
+        """Загружает активные пункты выдачи/доставки в память"""
+        self.execute_query(cursor, '''
+            SELECT id, name, address, city, location_type, delivery_price
+            FROM pickup_locations
+            WHERE is_active = 1
+            ORDER BY city, location_type, name, id
+        ''')
+
+        directory = {}
+        for row in self.fetchall(cursor):
+            location = {
+                'id': row[0],
+                'name': row[1],
+                'address': row[2],
+                'city': row[3],
+                'location_type': row[4] or 'pickup',
+                'delivery_price': float(row[5] or 0)
+            }
+            directory.setdefault((location['city'], location['location_type']), []).append(location)
+
+        with self._location_directory_lock:
+            self._location_directory = directory
+            self._location_directory_loaded_at = time.time()
+            self._location_directory_loaded = True
+
+        print(f"📍 Справочник пунктов выдачи загружен: {sum(len(v) for v in directory.values())} пунктов")
+
+    def refresh_location_directory(self):
+        """Перечитывает справочник пунктов выдачи из базы данных"""
+        with self._location_refresh_lock:
+            self._reload_location_directory()
+
+    def _reload_location_directory(self):
+        """Загружает справочник; при ошибке оставляет прежний и откладывает повтор"""
+        conn = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            try:
+                self._load_location_directory(cursor)
+            finally:
+                cursor.close()
+        except Exception as e:
+            with self._location_directory_lock:
+                if self._location_directory_loaded:
+                    # Прежний справочник есть: отдаем его и повторяем через TTL
+                    self._location_directory_loaded_at = time.time()
+                else:
+                    self._location_retry_at = time.time() + self.location_retry_backoff
+            print(f"❌ Ошибка загрузки справочника пунктов выдачи: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _location_directory_expired(self):
+        return time.time() - self._location_directory_loaded_at > self.location_directory_ttl
+
+    def _get_location_directory(self):
+        """Возвращает справочник, перечитывая его при истечении TTL.
+
+        Если справочник еще ни разу не загрузился, выбрасывает DatabaseUnavailable,
+        чтобы отсутствие данных не выглядело как отсутствие пунктов выдачи.
+        """
+        if not self._location_directory_loaded:
+            with self._location_refresh_lock:
+                if not self._location_directory_loaded and time.time() >= self._location_retry_at:
+                    self._reload_location_directory()
+            if not self._location_directory_loaded:
+                raise DatabaseUnavailable("Справочник пунктов выдачи не загружен")
+            return self._location_directory
+
+        if self._location_directory_expired():
+            # Перечитывает только один поток, остальные отдают текущий справочник
+            if self._location_refresh_lock.acquire(blocking=False):
+                try:
+                    if self._location_directory_expired():
+                        self._reload_location_directory()
+                finally:
+                    self._location_refresh_lock.release()
+        return self._location_directory
+
+    def get_locations(self, city=None, location_type=None):
+        """Возвращает активные пункты по городу и типу без обращения к БД"""
+        directory = self._get_location_directory()
+        locations = []
+        for (loc_city, loc_type), items in directory.items():
+            if city is not None and loc_city != city:
+                continue
+            if location_type is not None and loc_type != location_type:
+                continue
+            locations.extend(dict(item) for item in items)
+        return locations
+
+    def get_cities(self, location_type=None):
+        """Возвращает отсортированный список городов с активными пунктами"""
+        directory = self._get_location_directory()
+        return sorted({
+            loc_city for (loc_city, loc_type) in directory
+            if loc_city and (location_type is None or loc_type == location_type)
+        })
+
+    def get_delivery_price(self, city):
+        """Возвращает стоимость доставки по городу или None, если доставки нет"""
+        items = self._get_location_directory().get((city, 'delivery'))
+        if not items:
+            return None
+        return items[0]['delivery_price']
+
+    def add_pickup_location(self, name, address, city, location_type='pickup', delivery_price=0):
+        """Добавляет пункт выдачи/доставки и обновляет справочник"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            self.execute_query(cursor, '''
+                INSERT INTO pickup_locations (name, address, city, location_type, delivery_price, is_active)
+                VALUES (?, ?, ?, ?, ?, 1)
+            ''', (name, address, city, location_type, delivery_price))
+            location_id = self.lastrowid(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        self.refresh_location_directory()
+        return location_id
+
+    def update_pickup_location(self, location_id, **fields):
+        """Обновляет поля пункта выдачи/доставки и обновляет справочник"""
+        allowed = ('name', 'address', 'city', 'location_type', 'delivery_price', 'is_active')
+        updates = [(key, value) for key, value in fields.items() if key in allowed]
+        if not updates:
+            return False
+
+        params = [bool(value) if key == 'is_active' else value for key, value in updates]
+        if not self.is_postgres:
+            params = [int(value) if isinstance(value, bool) else value for value in params]
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            set_clause = ', '.join(f'{key} = ?' for key, _ in updates)
+            self.execute_query(cursor, f'UPDATE pickup_locations SET {set_clause} WHERE id = ?',
+                               params + [location_id])
+            updated = cursor.rowcount > 0
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        self.refresh_location_directory()
+        return updated
+
+    def delete_pickup_location(self, location_id):
+        """Деактивирует пункт выдачи/доставки"""
+        return self.update_pickup_location(location_id, is_active=False)
+
 # Для проверки работы базы данных
 if __name__ == '__main__':
     print("=" * 50)
@@ -0,0 +1,119 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import current_app, render_template
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BYTECODE_CACHE_DIR = os.path.join(BASE_DIR, '.jinja_cache')
+
+
+def _product_value(product, name):
+    """Читает поле товара, переданного как словарь или как объект"""
+    if isinstance(product, dict):
+        return product.get(name)
+    return getattr(product, name, None)
+
+
+def product_version(product):
+    """Версия товара для ключа кэша.
+
+    Берется row_version (увеличивается триггером при UPDATE), затем updated_at.
+    Если ни того, ни другого нет, используется хэш данных товара.
+    """
+    for field in ('row_version', 'updated_at'):
+        value = _product_value(product, field)
+        if value is not None:
+            return value
+
+    data = dict(product) if hasattr(product, 'keys') else vars(product)
+    return hashlib.sha1(repr(sorted(data.items(), key=lambda item: item[0])).encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """LRU-кэш отрисованных фрагментов и страниц товаров"""
+
+    def __init__(self, max_entries=2000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(self, key, render):
+        """Возвращает фрагмент из кэша или отрисовывает и сохраняет его"""
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = Markup(render())
+
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def invalidate_product(self, product_id):
+        """Удаляет все фрагменты товара (вызывать после изменения товара)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == product_id]:
+                del self._entries[key]
+
+    def clear(self):
+        """Очищает кэш целиком"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Статистика попаданий для мониторинга"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0,
+            }
+
+
+def render_product_card(product):
+    """Карточка товара для сетки каталога"""
+    cache = current_app.extensions['render_cache']
+    key = ('card', _product_value(product, 'id'), product_version(product))
+    return cache.get_or_render(key, lambda: render_template('partials/product_card.html', product=product))
+
+
+def render_product_page(product):
+    """Страница товара целиком (данные пользователя подгружаются на клиенте)"""
+    cache = current_app.extensions['render_cache']
+    key = ('detail', _product_value(product, 'id'), product_version(product))
+    return cache.get_or_render(key, lambda: render_template('product.html', product=product))
+
+
+def invalidate_product(product_id):
+    """Сбрасывает отрисованные фрагменты товара после его изменения"""
+    current_app.extensions['render_cache'].invalidate_product(product_id)
+
+
+def init_app(app):
+    """Подключает кэш байткода Jinja и кэш отрисованных товаров"""
+    # Байткод шаблонов сохраняется на диск, чтобы воркеры не компилировали их заново
+    bytecode_dir = app.config.get('JINJA_BYTECODE_CACHE_DIR') or DEFAULT_BYTECODE_CACHE_DIR
+    os.makedirs(bytecode_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+
+    cache = RenderCache(max_entries=int(app.config.get('RENDER_CACHE_MAX_ENTRIES', 2000)))
+    app.extensions['render_cache'] = cache
+    app.jinja_env.globals['render_product_card'] = render_product_card
+
+    print(f"🧩 Кэш шаблонов подключен (байткод: {bytecode_dir}, до {cache.max_entries} фрагментов)")
+    return cache
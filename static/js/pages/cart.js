@@ -0,0 +1,384 @@
+// Инициализация при загрузке страницы
+document.addEventListener('DOMContentLoaded', function() {
+    // Инициализация навигации
+    vapeShop.highlightActiveNav();
+    
+    // Настройка обработчиков для этой страницы
+    const checkoutBtn = document.getElementById('checkout-btn');
+    const orderForm = document.getElementById('order-form');
+    
+    if (checkoutBtn) {
+        checkoutBtn.addEventListener('click', async function() {
+            // Проверяем верификацию перед открытием модального окна
+            const isVerified = await vapeShop.checkVerification();
+            if (!isVerified) {
+                vapeShop.showNotification('Вы не верифицированы. Обратитесь к администратору @Danil_623', 'error');
+                return;
+            }
+            vapeShop.openOrderModal();
+        });
+    }
+    
+    if (orderForm) {
+        orderForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            vapeShop.submitOrder(e);
+        });
+    }
+    
+    // Обработчики для оплаты с баланса
+    const useBalanceCheckbox = document.getElementById('use-balance-checkbox');
+    const useBalanceFinal = document.getElementById('use-balance-final');
+    
+    if (useBalanceCheckbox) {
+        useBalanceCheckbox.addEventListener('change', function() {
+            vapeShop.updateBalancePayment();
+        });
+    }
+    
+    if (useBalanceFinal) {
+        useBalanceFinal.addEventListener('change', function() {
+            vapeShop.updateBalancePayment();
+            vapeShop.updateOrderSummary();
+        });
+    }
+    
+    // Загрузка корзины при открытии страницы
+    if (window.location.pathname === '/cart') {
+        vapeShop.loadCart();
+    }
+});
+
+// Глобальные функции для onclick атрибутов в HTML
+// Это нужно для кнопок в корзине и модальном окне
+
+function updateQuantityInCart(productId, newQuantity) {
+    vapeShop.updateQuantity(productId, newQuantity);
+}
+
+function removeFromCartItem(productId) {
+    vapeShop.removeFromCart(productId);
+}
+
+function openOrderModalGlobal() {
+    vapeShop.openOrderModal();
+}
+
+function closeModalGlobal() {
+    vapeShop.closeModal();
+}
+
+function selectCityGlobal(city) {
+    vapeShop.selectCity(city);
+}
+
+function setDeliveryTypeGlobal(type) {
+    vapeShop.setDeliveryType(type);
+}
+
+function nextOrderStepGlobal(nextStepId) {
+    vapeShop.nextOrderStep(nextStepId);
+}
+
+function prevOrderStepGlobal(prevStepId) {
+    vapeShop.prevOrderStep(prevStepId);
+}
+
+function showOrderStepGlobal(stepId) {
+    vapeShop.showOrderStep(stepId);
+}
+
+// Специальные функции для рендеринга корзины (будут вызваны из vapeShop)
+// Эти функции НЕ вызываем напрямую, только через vapeShop
+
+// Функция для обновления отображения корзины (вызывается из vapeShop.renderCart())
+window.renderCartItems = function(cart) {
+    const cartItems = document.getElementById('cart-items');
+    const cartTotalSection = document.getElementById('cart-total-section');
+    const emptyCart = document.getElementById('empty-cart');
+    const balancePaymentSection = document.getElementById('balance-payment-section');
+    const availableBalance = document.getElementById('available-balance');
+    
+    if (!cart.items || cart.items.length === 0) {
+        if (cartItems) cartItems.style.display = 'none';
+        if (cartTotalSection) cartTotalSection.style.display = 'none';
+        if (balancePaymentSection) balancePaymentSection.style.display = 'none';
+        if (emptyCart) emptyCart.style.display = 'block';
+        return;
+    }
+    
+    if (emptyCart) emptyCart.style.display = 'none';
+    if (cartTotalSection) cartTotalSection.style.display = 'block';
+    
+    // Показываем раздел оплаты с баланса
+    if (balancePaymentSection) {
+        balancePaymentSection.style.display = 'block';
+        // Загружаем баланс пользователя
+        vapeShop.loadUserBalance();
+    }
+    
+    if (cartItems) {
+        cartItems.style.display = 'block';
+        cartItems.innerHTML = cart.items.map(item => `
+            <div class="cart-item">
+                <div class="cart-item-image">
+                    <img src="${item.image}" alt="${item.name}" onerror="this.src='/static/images/default-product.png'">
+                </div>
+                <div class="cart-item-info">
+                    <h4>${item.name}</h4>
+                    <div class="item-price">${item.price} руб. × ${item.quantity}</div>
+                    <div class="quantity-controls">
+                        <button class="quantity-btn" onclick="updateQuantityInCart(${item.id}, ${item.quantity - 1})">-</button>
+                        <span>${item.quantity}</span>
+                        <button class="quantity-btn" onclick="updateQuantityInCart(${item.id}, ${item.quantity + 1})">+</button>
+                    </div>
+                </div>
+                <div class="item-total">${item.total} руб.</div>
+            </div>
+        `).join('');
+    }
+    
+    if (document.getElementById('cart-total')) {
+        document.getElementById('cart-total').textContent = cart.total + ' руб.';
+    }
+    if (document.getElementById('cashback-amount')) {
+        // Рассчитываем кешбек по системе лояльности
+        vapeShop.updateLoyaltyCashback(cart.total);
+    }
+    
+    // Обновляем информацию о балансе
+    if (availableBalance && vapeShop.userBalance !== undefined) {
+        availableBalance.textContent = vapeShop.userBalance + ' руб.';
+    }
+    
+    // Обновляем оплату с баланса
+    vapeShop.updateBalancePayment();
+};
+
+// Функция для отображения городов (вызывается из vapeShop.loadCities())
+window.renderCities = function(cities) {
+    const citySelector = document.getElementById('city-selector');
+    if (!citySelector) return;
+    
+    if (cities.length === 0) {
+        citySelector.innerHTML = '<div class="loading-cities">Нет доступных городов</div>';
+        return;
+    }
+    
+    citySelector.innerHTML = cities.map(city => `
+        <button type="button" class="city-btn" onclick="selectCityGlobal('${city}')">
+            ${city}
+        </button>
+    `).join('');
+};
+
+// Функция для обновления информации о выбранном городе
+window.updateSelectedCityUI = function(city) {
+    const cityInfo = document.getElementById('city-info');
+    const selectedCityName = document.getElementById('selected-city-name');
+    
+    if (cityInfo && selectedCityName) {
+        selectedCityName.textContent = city;
+        cityInfo.style.display = 'block';
+    }
+    
+    // Обновить активные кнопки городов
+    const cityButtons = document.querySelectorAll('.city-btn');
+    cityButtons.forEach(btn => {
+        if (btn.textContent.trim() === city) {
+            btn.classList.add('active');
+        } else {
+            btn.classList.remove('active');
+        }
+    });
+    
+    // Обновить кнопку Далее
+    const nextBtn = document.getElementById('next-city-btn');
+    if (nextBtn) {
+        nextBtn.disabled = !city;
+    }
+};
+
+// Функция для отображения пунктов выдачи (вызывается из vapeShop.loadPickupLocations())
+window.renderPickupLocations = function(locations) {
+    const pickupLocationSelect = document.getElementById('pickup-location');
+    if (!pickupLocationSelect) return;
+    
+    pickupLocationSelect.innerHTML = '<option value="">Выберите пункт выдачи</option>';
+    
+    if (locations.length === 0) {
+        pickupLocationSelect.innerHTML += '<option value="" disabled>Нет доступных пунктов</option>';
+        pickupLocationSelect.disabled = true;
+    } else {
+        locations.forEach(loc => {
+            pickupLocationSelect.innerHTML += `<option value="${loc.id}">${loc.name} - ${loc.address}</option>`;
+        });
+        pickupLocationSelect.disabled = false;
+    }
+};
+
+// Функция для обновления сводки заказа
+window.updateOrderSummaryUI = function(data) {
+    const orderItemsList = document.getElementById('order-items-list');
+    const orderSubtotal = document.getElementById('order-subtotal');
+    const deliveryFeeRow = document.getElementById('delivery-fee-row');
+    const deliveryFee = document.getElementById('delivery-fee');
+    const finalTotal = document.getElementById('final-total');
+    const summaryCashback = document.getElementById('summary-cashback');
+    const summaryLoyaltyLevel = document.getElementById('summary-loyalty-level');
+    const summaryBalance = document.getElementById('summary-balance');
+    const summaryRemaining = document.getElementById('summary-remaining');
+    const balanceAfterPayment = document.getElementById('balance-after-payment');
+    const useBalanceFinal = document.getElementById('use-balance-final');
+    
+    if (!orderItemsList || !orderSubtotal) return;
+    
+    let itemsHtml = '';
+    let subtotal = 0;
+    
+    if (data.cart && data.cart.items) {
+        data.cart.items.forEach(item => {
+            const itemTotal = item.price * item.quantity;
+            subtotal += itemTotal;
+            itemsHtml += `
+                <div class="order-item">
+                    <span>${item.name} × ${item.quantity}</span>
+                    <span>${itemTotal} руб.</span>
+                </div>
+            `;
+        });
+    }
+    
+    orderItemsList.innerHTML = itemsHtml;
+    orderSubtotal.textContent = subtotal + ' руб.';
+    
+    const deliveryPrice = data.deliveryPrice || 0;
+    const total = subtotal + deliveryPrice;
+    
+    if (deliveryPrice > 0) {
+        if (deliveryFeeRow) deliveryFeeRow.style.display = 'flex';
+        if (deliveryFee) deliveryFee.textContent = deliveryPrice + ' руб.';
+    } else {
+        if (deliveryFeeRow) deliveryFeeRow.style.display = 'none';
+    }
+    
+    if (finalTotal) {
+        finalTotal.textContent = total + ' руб.';
+    }
+    
+    // Обновляем информацию о кешбеке
+    const cashbackData = vapeShop.calculateLoyaltyCashback(total);
+    if (summaryCashback) {
+        summaryCashback.textContent = cashbackData.amount.toFixed(2) + ' руб.';
+    }
+    if (summaryLoyaltyLevel) {
+        summaryLoyaltyLevel.textContent = cashbackData.level + ' (' + (cashbackData.rate * 100).toFixed(1) + '%)';
+    }
+    
+    // Обновляем информацию о балансе
+    if (summaryBalance && vapeShop.userBalance !== undefined) {
+        summaryBalance.textContent = vapeShop.userBalance + ' руб.';
+    }
+    
+    // Обновляем оплату с баланса
+    if (useBalanceFinal && useBalanceFinal.checked) {
+        if (summaryRemaining && vapeShop.userBalance !== undefined) {
+            const remaining = vapeShop.userBalance - total;
+            summaryRemaining.textContent = remaining.toFixed(2) + ' руб.';
+            balanceAfterPayment.style.display = 'flex';
+        }
+    } else {
+        balanceAfterPayment.style.display = 'none';
+    }
+};
+
+// Функция для обновления сводки данных заказа
+window.updateOrderDetailsSummaryUI = function(data) {
+    const name = document.getElementById('customer-name');
+    const phone = document.getElementById('customer-phone');
+    const pickupSelect = document.getElementById('pickup-location');
+    const deliveryAddress = document.getElementById('delivery-address');
+    
+    if (name && name.value) {
+        const summaryName = document.getElementById('summary-name');
+        if (summaryName) summaryName.textContent = name.value;
+    }
+    
+    if (phone && phone.value) {
+        const summaryPhone = document.getElementById('summary-phone');
+        if (summaryPhone) summaryPhone.textContent = phone.value;
+    }
+    
+    const deliveryType = data.deliveryType || 'pickup';
+    const deliveryTypeText = deliveryType === 'pickup' ? 'Самовывоз' : 'Доставка';
+    const summaryDeliveryType = document.getElementById('summary-delivery-type');
+    if (summaryDeliveryType) summaryDeliveryType.textContent = deliveryTypeText;
+    
+    const selectedCity = data.selectedCity || null;
+    const summaryCity = document.getElementById('summary-city');
+    if (summaryCity) summaryCity.textContent = selectedCity || '-';
+    
+    if (deliveryType === 'pickup') {
+        const summaryPickupItem = document.getElementById('summary-pickup-item');
+        const summaryAddressItem = document.getElementById('summary-address-item');
+        if (summaryPickupItem) summaryPickupItem.style.display = 'flex';
+        if (summaryAddressItem) summaryAddressItem.style.display = 'none';
+        
+        const summaryPickup = document.getElementById('summary-pickup');
+        if (pickupSelect && pickupSelect.value && summaryPickup) {
+            const selectedOption = pickupSelect.options[pickupSelect.selectedIndex];
+            summaryPickup.textContent = selectedOption.text || '-';
+        } else if (summaryPickup) {
+            summaryPickup.textContent = '-';
+        }
+    } else {
+        const summaryPickupItem = document.getElementById('summary-pickup-item');
+        const summaryAddressItem = document.getElementById('summary-address-item');
+        if (summaryPickupItem) summaryPickupItem.style.display = 'none';
+        if (summaryAddressItem) summaryAddressItem.style.display = 'flex';
+        
+        const summaryAddress = document.getElementById('summary-address');
+        if (deliveryAddress && deliveryAddress.value && summaryAddress) {
+            summaryAddress.textContent = deliveryAddress.value || '-';
+        } else if (summaryAddress) {
+            summaryAddress.textContent = '-';
+        }
+    }
+};
+
+// Функция для обновления информации о доставке
+window.updateDeliveryPriceUI = function(price) {
+    const deliveryPriceElement = document.getElementById('delivery-price-amount');
+    if (deliveryPriceElement) {
+        deliveryPriceElement.textContent = price;
+    }
+};
+
+// Функция для отображения шагов оформления заказа
+window.showOrderStepUI = function(stepId) {
+    document.querySelectorAll('.order-step').forEach(step => {
+        step.style.display = 'none';
+        step.classList.remove('active');
+    });
+    
+    const step = document.getElementById(`step-${stepId}`);
+    if (step) {
+        step.style.display = 'block';
+        step.classList.add('active');
+    }
+};
+
+// Функция для обновления информации о верификации
+window.updateVerificationWarning = function(isVerified) {
+    const verificationWarning = document.getElementById('verification-warning');
+    const submitOrderBtn = document.getElementById('submit-order-btn');
+    
+    if (verificationWarning) {
+        verificationWarning.style.display = isVerified ? 'none' : 'flex';
+    }
+    
+    if (submitOrderBtn) {
+        submitOrderBtn.disabled = !isVerified;
+        submitOrderBtn.textContent = isVerified ? 'Подтвердить заказ' : 'Верификация требуется';
+    }
+};
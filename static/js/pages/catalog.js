@@ -0,0 +1,284 @@
+// Текущие фильтры
+let currentSection = 'all';
+let currentCategory = 'all';
+let allProducts = [];
+let currentProducts = [];
+
+document.addEventListener('DOMContentLoaded', function() {
+    vapeShop.highlightActiveNav();
+    
+    // Получаем параметры из URL
+    const urlParams = new URLSearchParams(window.location.search);
+    const sectionParam = urlParams.get('section') || 'all';
+    const categoryParam = urlParams.get('category') || 'all';
+    
+    // Сохраняем текущие товары
+    const productElements = document.querySelectorAll('.product-card');
+    allProducts = Array.from(productElements).map(el => ({
+        id: el.getAttribute('onclick')?.match(/product\/(\d+)/)?.[1] || '',
+        name: el.querySelector('.product-name')?.textContent || '',
+        description: el.querySelector('.product-description')?.textContent || '',
+        price: el.querySelector('.product-price')?.textContent || '',
+        image: el.querySelector('img')?.src || ''
+    }));
+    currentProducts = [...allProducts];
+    
+    // Устанавливаем текущие фильтры
+    currentSection = sectionParam;
+    currentCategory = categoryParam;
+    
+    // Устанавливаем выбранное значение в фильтре разделов
+    const sectionFilter = document.getElementById('section-filter');
+    if (sectionFilter) {
+        sectionFilter.value = currentSection;
+        
+        // Если выбран раздел (не "все"), загружаем его категории
+        if (currentSection !== 'all') {
+            loadCategoriesForSection(currentSection);
+            showCategoryFilter();
+            
+            // Если есть выбранная категория, помечаем ее активной
+            if (currentCategory !== 'all') {
+                setTimeout(() => {
+                    markCategoryAsActive(currentCategory);
+                }, 300);
+            }
+        }
+    }
+    
+    // Обработчик изменения раздела
+    if (sectionFilter) {
+        sectionFilter.addEventListener('change', function() {
+            const sectionId = this.value;
+            handleSectionChange(sectionId);
+        });
+    }
+});
+
+// Обработка изменения раздела
+function handleSectionChange(sectionId) {
+    currentSection = sectionId;
+    currentCategory = 'all'; // Сбрасываем категорию при смене раздела
+    
+    if (sectionId === 'all') {
+        // Скрываем фильтр категорий
+        hideCategoryFilter();
+        // Показываем все товары
+        updateProducts();
+    } else {
+        // Показываем фильтр категорий и загружаем категории
+        showCategoryFilter();
+        loadCategoriesForSection(sectionId);
+    }
+    
+    // Обновляем URL без перезагрузки страницы
+    updateURL();
+}
+
+// Показать фильтр категорий
+function showCategoryFilter() {
+    const categorySection = document.getElementById('category-filter-section');
+    if (categorySection) {
+        categorySection.style.display = 'block';
+    }
+}
+
+// Скрыть фильтр категорий
+function hideCategoryFilter() {
+    const categorySection = document.getElementById('category-filter-section');
+    if (categorySection) {
+        categorySection.style.display = 'none';
+    }
+}
+
+// Загрузить категории для выбранного раздела
+function loadCategoriesForSection(sectionId) {
+    const container = document.getElementById('category-buttons-container');
+    const clearBtn = document.getElementById('clear-category-btn');
+    
+    if (!container) return;
+    
+    // Показываем загрузку
+    container.innerHTML = '<div class="loading-categories">Загрузка категорий...</div>';
+    
+    fetch(`/api/categories/section/${sectionId}`)
+        .then(response => response.json())
+        .then(categories => {
+            if (categories.length === 0) {
+                container.innerHTML = '<div class="no-categories">В этом разделе пока нет категорий</div>';
+                if (clearBtn) clearBtn.style.display = 'none';
+                return;
+            }
+            
+            // Создаем кнопки категорий
+            let html = `
+                <button type="button" class="category-btn all-categories active" onclick="selectCategory('all')">
+                    Все категории
+                </button>
+            `;
+            
+            categories.forEach(category => {
+                html += `
+                    <button type="button" class="category-btn" data-category-id="${category.id}" onclick="selectCategory('${category.id}')">
+                        ${category.name}
+                    </button>
+                `;
+            });
+            
+            container.innerHTML = html;
+            if (clearBtn) clearBtn.style.display = 'block';
+            
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки категорий:', error);
+            container.innerHTML = '<div class="error-categories">Ошибка загрузки категорий</div>';
+            if (clearBtn) clearBtn.style.display = 'none';
+        });
+}
+
+// Выбор категории
+function selectCategory(categoryId) {
+    currentCategory = categoryId;
+    
+    // Обновляем активную кнопку категории
+    markCategoryAsActive(categoryId);
+    
+    // Обновляем товары
+    updateProducts();
+    
+    // Обновляем URL
+    updateURL();
+}
+
+// Пометить категорию как активную
+function markCategoryAsActive(categoryId) {
+    const categoryButtons = document.querySelectorAll('.category-btn');
+    categoryButtons.forEach(button => {
+        const btnCategoryId = button.getAttribute('data-category-id') || 'all';
+        if (btnCategoryId === categoryId) {
+            button.classList.add('active');
+        } else {
+            button.classList.remove('active');
+        }
+    });
+}
+
+// Очистить фильтр категорий
+function clearCategoryFilter() {
+    currentCategory = 'all';
+    markCategoryAsActive('all');
+    updateProducts();
+    updateURL();
+}
+
+// Обновить список товаров
+function updateProducts() {
+    let url = '/catalog';
+    const params = [];
+    
+    if (currentSection !== 'all') {
+        params.push(`section=${currentSection}`);
+    }
+    
+    if (currentCategory !== 'all') {
+        params.push(`category=${currentCategory}`);
+    }
+    
+    if (params.length > 0) {
+        url += '?' + params.join('&');
+    }
+    
+    // Показываем индикатор загрузки
+    const productsGrid = document.getElementById('products-grid');
+    if (productsGrid) {
+        productsGrid.innerHTML = '<div class="loading-products">Загрузка товаров...</div>';
+    }
+    
+    // Удаляем старый блок пустого каталога, если он есть
+    const oldEmptyCatalog = document.querySelector('.empty-catalog');
+    if (oldEmptyCatalog) {
+        oldEmptyCatalog.remove();
+    }
+    
+    // Загружаем товары через AJAX
+    fetch(url, {
+        headers: {
+            'X-Requested-With': 'XMLHttpRequest'
+        }
+    })
+        .then(response => response.text())
+        .then(html => {
+            // Парсим HTML и извлекаем только сетку товаров
+            const parser = new DOMParser();
+            const doc = parser.parseFromString(html, 'text/html');
+            
+            // Находим продукты в новом HTML
+            const newProductsGrid = doc.querySelector('.products-grid');
+            const newEmptyCatalog = doc.querySelector('.empty-catalog');
+            
+            if (productsGrid) {
+                if (newProductsGrid && newProductsGrid.innerHTML.trim()) {
+                    productsGrid.innerHTML = newProductsGrid.innerHTML;
+                    
+                    // Проверяем, есть ли товары
+                    const hasProducts = productsGrid.innerHTML.includes('product-card');
+                    
+                    // Если есть empty-catalog, но есть товары - удаляем его
+                    if (newEmptyCatalog && hasProducts) {
+                        const existingEmpty = document.querySelector('.empty-catalog');
+                        if (existingEmpty) {
+                            existingEmpty.remove();
+                        }
+                    }
+                    
+                    // Если есть empty-catalog и нет товаров - добавляем его
+                    if (newEmptyCatalog && !hasProducts) {
+                        productsGrid.insertAdjacentHTML('afterend', newEmptyCatalog.outerHTML);
+                    }
+                } else if (newEmptyCatalog) {
+                    // Если нет товаров, показываем сообщение
+                    productsGrid.innerHTML = '';
+                    productsGrid.insertAdjacentHTML('afterend', newEmptyCatalog.outerHTML);
+                }
+            }
+        })
+        .catch(error => {
+            console.error('Ошибка загрузки товаров:', error);
+            if (productsGrid) {
+                productsGrid.innerHTML = '<div class="error">Ошибка загрузки товаров</div>';
+            }
+        });
+}
+
+// Обновить URL без перезагрузки страницы
+function updateURL() {
+    const params = [];
+    
+    if (currentSection !== 'all') {
+        params.push(`section=${currentSection}`);
+    }
+    
+    if (currentCategory !== 'all') {
+        params.push(`category=${currentCategory}`);
+    }
+    
+    let url = '/catalog';
+    if (params.length > 0) {
+        url += '?' + params.join('&');
+    }
+    
+    // Обновляем URL в адресной строке без перезагрузки страницы
+    window.history.pushState({}, '', url);
+}
+
+// Обработка кнопки "назад" в браузере
+window.addEventListener('popstate', function() {
+    // Перезагружаем страницу для полной синхронизации
+    window.location.reload();
+});
+
+// Функция для быстрого добавления в корзину с карточки товара
+function addToCartFromCard(productId, event) {
+    event.stopPropagation(); // Предотвращаем переход на страницу товара
+    vapeShop.addToCart(productId);
+}
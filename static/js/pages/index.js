@@ -0,0 +1,197 @@
+document.addEventListener('DOMContentLoaded', function() {
+    loadFeaturedCategories();
+    loadLeaderboard();
+    
+    // Обновляем профиль
+    updateMiniProfile();
+    
+    // Добавляем обработчик скролла для фиксированного профиля
+    window.addEventListener('scroll', function() {
+        const profileHeader = document.getElementById('profile-header-fixed');
+        if (profileHeader) {
+            if (window.scrollY > 10) {
+                profileHeader.classList.add('scrolled');
+            } else {
+                profileHeader.classList.remove('scrolled');
+            }
+        }
+    });
+});
+
+// Функция обновления мини-профиля
+function updateMiniProfile() {
+    const user = window.vapeShop?.user;
+    const balance = window.vapeShop?.balance || 0;
+    
+    if (user) {
+        const avatar = document.getElementById('user-avatar');
+        const username = document.getElementById('username');
+        const balanceEl = document.getElementById('balance');
+        
+        if (avatar) {
+            avatar.src = user.photo_url || '/static/images/default-avatar.png';
+            avatar.onerror = function() {
+                this.src = '/static/images/default-avatar.png';
+            };
+        }
+        if (username) username.textContent = user.first_name || 'Пользователь';
+        if (balanceEl) balanceEl.textContent = balance + ' руб.';
+    } else {
+        // Если данные еще не загружены, попробуем через секунду
+        setTimeout(updateMiniProfile, 1000);
+    }
+}
+
+async function loadFeaturedCategories() {
+    try {
+        const response = await fetch('/api/products/featured');
+        const categories = await response.json();
+        renderFeaturedCategories(categories);
+    } catch (error) {
+        console.error('Ошибка загрузки популярных товаров:', error);
+        document.getElementById('featured-categories').innerHTML = 
+            '<div class="error">Ошибка загрузки товаров</div>';
+    }
+}
+
+function renderFeaturedCategories(categories) {
+    const container = document.getElementById('featured-categories');
+    
+    if (!categories || Object.keys(categories).length === 0) {
+        container.innerHTML = `
+            <div class="no-products">
+                <div style="font-size: 40px; margin-bottom: 15px;">🎯</div>
+                <h3 style="margin-bottom: 10px; color: #fff; font-size: 18px;">Популярные товары скоро появятся</h3>
+                <p>Администратор добавляет товары в магазин</p>
+            </div>
+        `;
+        return;
+    }
+    
+    let html = '';
+    
+    for (const [categoryId, categoryData] of Object.entries(categories)) {
+        const products = categoryData.products || [];
+        
+        if (products.length === 0) {
+            continue;
+        }
+        
+        html += `
+            <div class="featured-category">
+                <div class="category-header">
+                    <div class="category-title">
+                        <span class="category-icon">${categoryData.icon || '🎯'}</span>
+                        <span>${categoryData.display_name || 'Популярное'}</span>
+                    </div>
+                    <a href="/catalog?category=${categoryId}" class="view-all">
+                        Все товары →
+                    </a>
+                </div>
+                <div class="horizontal-products-scroll">
+                    ${products.map(product => `
+                        <div class="horizontal-product-card" onclick="window.location.href='/product/${product.id}'">
+                            <div class="horizontal-product-image">
+                                <img src="${product.image_path}" alt="${product.name}" 
+                                     onerror="this.src='/static/images/default-product.png'">
+                            </div>
+                            <div class="horizontal-product-info">
+                                <h3 class="horizontal-product-name">${product.name}</h3>
+                                <p class="horizontal-product-description">${product.description}</p>
+                                <div class="horizontal-product-price">${product.price} руб.</div>
+                            </div>
+                        </div>
+                    `).join('')}
+                </div>
+            </div>
+        `;
+    }
+    
+    if (html === '') {
+        container.innerHTML = `
+            <div class="no-products">
+                <div style="font-size: 40px; margin-bottom: 15px;">📦</div>
+                <h3 style="margin-bottom: 10px; color: #fff; font-size: 18px;">Товары скоро появятся</h3>
+                <p>Администратор добавляет товары в магазин</p>
+            </div>
+        `;
+    } else {
+        container.innerHTML = html;
+    }
+}
+
+async function loadLeaderboard() {
+    try {
+        const response = await fetch('/api/leaderboard');
+        const leaders = await response.json();
+        renderLeaderboard(leaders);
+    } catch (error) {
+        console.error('Ошибка загрузки лидерборда:', error);
+        document.getElementById('leaderboard-container').innerHTML = 
+            '<div class="error">Ошибка загрузки лидерборда</div>';
+    }
+}
+
+function renderLeaderboard(leaders) {
+    const container = document.getElementById('leaderboard-container');
+    
+    if (!leaders || leaders.length === 0) {
+        container.innerHTML = `
+            <div class="empty-leaderboard">
+                <div class="empty-icon">🏆</div>
+                <h3>Лидерборд пуст</h3>
+                <p>Станьте первым!</p>
+            </div>
+        `;
+        return;
+    }
+    
+    let html = '<div class="leaderboard-container">';
+    
+    leaders.forEach((leader, index) => {
+        const rankClass = index === 0 ? 'rank-1' : 
+                         index === 1 ? 'rank-2' : 
+                         index === 2 ? 'rank-3' : 'rank-other';
+        
+        html += `
+            <div class="leaderboard-item">
+                <div class="leaderboard-rank ${rankClass}">
+                    ${leader.rank || index + 1}
+                </div>
+                <div class="leaderboard-avatar">
+                    <img src="${leader.photo_url}" alt="${leader.first_name}"
+                         onerror="this.src='/static/images/default-avatar.png'">
+                </div>
+                <div class="leaderboard-info">
+                    <div class="leaderboard-name">
+                        ${leader.first_name || 'Пользователь'}
+                        <span class="verified-badge ${leader.is_verified ? 'verified-true' : 'verified-false'}">
+                            ${leader.is_verified ? '✓ Верифицирован' : 'Не верифицирован'}
+                        </span>
+                    </div>
+                    <div class="leaderboard-stats">
+                        <div class="stat-item">
+                            <span class="stat-label">Заказов:</span>
+                            <span class="stat-value">${leader.total_orders || 0}</span>
+                        </div>
+                        <div class="stat-item">
+                            <span class="stat-label">Приглашено:</span>
+                            <span class="stat-value">${leader.total_invited || 0}</span>
+                        </div>
+                        <div class="stat-item">
+                            <span class="stat-label">Баланс:</span>
+                            <span class="stat-value">${leader.balance || 0} руб.</span>
+                        </div>
+                    </div>
+                </div>
+                <div class="leaderboard-total">
+                    <div class="leaderboard-amount">${leader.total_spent || 0} руб.</div>
+                    <div class="leaderboard-label">Общие траты</div>
+                </div>
+            </div>
+        `;
+    });
+    
+    html += '</div>';
+    container.innerHTML = html;
+}
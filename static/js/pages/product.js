@@ -0,0 +1,42 @@
+document.addEventListener('DOMContentLoaded', function() {
+    vapeShop.highlightActiveNav(); // Подсветка активной вкладки
+    
+    // Обновляем мини-профиль
+    updateMiniProfile();
+    
+    // Добавляем обработчик скролла для фиксированного профиля
+    window.addEventListener('scroll', function() {
+        const profileHeader = document.getElementById('profile-header-fixed');
+        if (profileHeader) {
+            if (window.scrollY > 10) {
+                profileHeader.classList.add('scrolled');
+            } else {
+                profileHeader.classList.remove('scrolled');
+            }
+        }
+    });
+});
+
+// Функция обновления мини-профиля
+function updateMiniProfile() {
+    const user = window.vapeShop?.user;
+    const balance = window.vapeShop?.balance || 0;
+    
+    if (user) {
+        const avatar = document.getElementById('user-avatar');
+        const username = document.getElementById('username');
+        const balanceEl = document.getElementById('balance');
+        
+        if (avatar) {
+            avatar.src = user.photo_url || '/static/images/default-avatar.png';
+            avatar.onerror = function() {
+                this.src = '/static/images/default-avatar.png';
+            };
+        }
+        if (username) username.textContent = user.first_name || 'Пользователь';
+        if (balanceEl) balanceEl.textContent = balance + ' руб.';
+    } else {
+        // Если данные еще не загружены, попробуем через секунду
+        setTimeout(updateMiniProfile, 1000);
+    }
+}
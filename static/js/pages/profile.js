@@ -0,0 +1,274 @@
+document.addEventListener('DOMContentLoaded', function() {
+    vapeShop.highlightActiveNav();
+    loadProfileData();
+    loadOrders();
+});
+
+function loadProfileData() {
+    const user = window.vapeShop?.user || {
+        first_name: 'Тестовый',
+        photo_url: '/static/images/default-avatar.png'
+    };
+    
+    const balance = window.vapeShop?.balance || 0;
+    
+    // Обновляем профиль
+    const avatar = document.getElementById('profile-avatar');
+    const username = document.getElementById('profile-username');
+    const mainBalance = document.getElementById('main-balance');
+    
+    if (avatar) {
+        avatar.src = user.photo_url || '/static/images/default-avatar.png';
+        avatar.onerror = function() {
+            this.src = '/static/images/default-avatar.png';
+        };
+    }
+    
+    if (username) username.textContent = user.first_name || 'Пользователь';
+    if (mainBalance) mainBalance.textContent = balance + ' руб.';
+}
+
+async function loadOrders() {
+    try {
+        const response = await fetch('/api/user/profile');
+        const data = await response.json();
+        renderOrders(data.orders || []);
+        
+        // Обновляем все данные профиля
+        updateProfileInfo(data);
+        
+    } catch (error) {
+        console.error('Ошибка загрузки заказов:', error);
+        const ordersList = document.getElementById('orders-list');
+        if (ordersList) {
+            ordersList.innerHTML = '<div class="error">Ошибка загрузки заказов. Попробуйте обновить страницу.</div>';
+        }
+    }
+}
+
+function updateProfileInfo(data) {
+    // Обновляем баланс
+    if (data.balance !== undefined) {
+        const mainBalance = document.getElementById('main-balance');
+        if (mainBalance) {
+            mainBalance.textContent = data.balance + ' руб.';
+        }
+        if (window.vapeShop) {
+            window.vapeShop.balance = data.balance;
+        }
+    }
+    
+    // Обновляем статус верификации
+    const verifiedBadge = document.getElementById('verified-badge');
+    if (verifiedBadge) {
+        if (data.is_verified) {
+            verifiedBadge.textContent = '✓ Верифицирован';
+            verifiedBadge.className = 'verified-badge verified-true';
+        } else {
+            verifiedBadge.textContent = 'Не верифицирован';
+            verifiedBadge.className = 'verified-badge verified-false';
+        }
+    }
+    
+    // Обновляем реферальную информацию
+    const referralCode = document.getElementById('referral-code-text');
+    if (referralCode && data.referral_code) {
+        referralCode.textContent = data.referral_code;
+    }
+    
+    const referralCount = document.getElementById('referral-count');
+    if (referralCount && data.total_invited !== undefined) {
+        referralCount.textContent = data.total_invited;
+    }
+    
+    // Обновляем систему лояльности
+    const loyaltyLevel = document.getElementById('loyalty-level');
+    if (loyaltyLevel && data.loyalty_level) {
+        loyaltyLevel.textContent = data.loyalty_level;
+    }
+    
+    const loyaltyPercent = document.getElementById('loyalty-percent');
+    if (loyaltyPercent && data.loyalty_rate !== undefined) {
+        loyaltyPercent.textContent = data.loyalty_rate.toFixed(1) + '%';
+    }
+    
+    const totalSpent = document.getElementById('total-spent');
+    if (totalSpent && data.total_spent !== undefined) {
+        totalSpent.innerHTML = `<span id="total-spent-value">${data.total_spent.toFixed(2)}</span> руб.`;
+    }
+    
+    const nextLevel = document.getElementById('next-level');
+    if (nextLevel && data.next_level_threshold !== undefined) {
+        nextLevel.textContent = data.next_level_threshold.toLocaleString() + ' руб.';
+    }
+    
+    const loyaltyProgressBar = document.getElementById('loyalty-progress-bar');
+    if (loyaltyProgressBar && data.progress_percentage !== undefined) {
+        loyaltyProgressBar.style.width = data.progress_percentage + '%';
+    }
+    
+    const loyaltyTotalSpent = document.getElementById('loyalty-total-spent');
+    if (loyaltyTotalSpent && data.total_spent !== undefined) {
+        loyaltyTotalSpent.textContent = data.total_spent.toFixed(2) + ' руб.';
+    }
+    
+    const totalOrders = document.getElementById('total-orders');
+    if (totalOrders && data.total_orders !== undefined) {
+        totalOrders.textContent = data.total_orders;
+    }
+    
+    // Обновляем заработанное по рефералам (примерная логика)
+    const referralEarned = document.getElementById('referral-earned');
+    if (referralEarned && data.total_invited !== undefined) {
+        const earned = data.total_invited * 100;
+        referralEarned.textContent = earned + ' руб.';
+    }
+}
+
+function renderOrders(orders) {
+    const ordersList = document.getElementById('orders-list');
+    
+    if (!ordersList) return;
+    
+    if (orders.length === 0) {
+        ordersList.innerHTML = `
+            <div class="empty-orders">
+                <div class="empty-icon">📦</div>
+                <h4>Заказов пока нет</h4>
+                <p>Сделайте свой первый заказ!</p>
+            </div>
+        `;
+        return;
+    }
+    
+    ordersList.innerHTML = orders.map(order => {
+        // Определяем текст статуса
+        let statusText = '';
+        let statusClass = '';
+        
+        switch(order.status) {
+            case 'completed':
+                statusText = 'ВЫПОЛНЕН';
+                statusClass = 'status-completed';
+                break;
+            case 'pending':
+                statusText = 'В ОБРАБОТКЕ';
+                statusClass = 'status-pending';
+                break;
+            case 'cancelled':
+                statusText = 'ОТМЕНЕН';
+                statusClass = 'status-cancelled';
+                break;
+            default:
+                statusText = order.status.toUpperCase();
+                statusClass = 'status-pending';
+        }
+        
+        // Форматируем дату
+        const orderDate = new Date(order.created_at);
+        const formattedDate = orderDate.toLocaleDateString('ru-RU', {
+            day: '2-digit',
+            month: '2-digit',
+            year: 'numeric',
+            hour: '2-digit',
+            minute: '2-digit'
+        });
+        
+        // Определяем информацию о получении
+        let deliveryInfo = '';
+        if (order.delivery_type === 'pickup') {
+            deliveryInfo = order.pickup_location || 'Пункт выдачи не указан';
+        } else {
+            deliveryInfo = order.delivery_city ? `Доставка в ${order.delivery_city}` : 'Доставка';
+            if (order.delivery_address) {
+                deliveryInfo += `, ${order.delivery_address}`;
+            }
+        }
+        
+        return `
+            <div class="order-item">
+                <div class="order-header">
+                    <div class="order-id">Заказ #${order.id}</div>
+                    <div class="order-date">${formattedDate}</div>
+                </div>
+                <div class="order-details">
+                    <div>
+                        <span>Сумма:</span>
+                        <span>${order.total_amount} руб.</span>
+                    </div>
+                    <div>
+                        <span>Кешбек:</span>
+                        <span>+${order.cashback_earned} руб.</span>
+                    </div>
+                    <div>
+                        <span>Получение:</span>
+                        <span style="color: #00ff88; font-weight: 500;">${deliveryInfo}</span>
+                    </div>
+                    <div>
+                        <span>Статус:</span>
+                        <span class="order-status ${statusClass}">${statusText}</span>
+                    </div>
+                </div>
+            </div>
+        `;
+    }).join('');
+}
+
+function copyReferralCode() {
+    const referralCodeElement = document.getElementById('referral-code-text');
+    const referralCode = referralCodeElement.textContent;
+    
+    if (!referralCode || referralCode === 'Загрузка...') {
+        alert('Реферальный код еще не загружен');
+        return;
+    }
+    
+    // Создаем полную реферальную ссылку
+    const referralLink = window.location.origin + '?ref=' + referralCode;
+    
+    navigator.clipboard.writeText(referralLink).then(() => {
+        // Меняем текст кнопки на время
+        const copyBtn = document.querySelector('.copy-btn');
+        const originalText = copyBtn.innerHTML;
+        
+        copyBtn.innerHTML = '<span class="copy-icon">✓</span><span class="copy-text">Скопировано!</span>';
+        copyBtn.style.background = '#00ff88';
+        copyBtn.style.color = '#000';
+        
+        setTimeout(() => {
+            copyBtn.innerHTML = originalText;
+            copyBtn.style.background = '';
+            copyBtn.style.color = '';
+        }, 2000);
+    }).catch(err => {
+        console.error('Ошибка копирования: ', err);
+        alert('Не удалось скопировать ссылку. Попробуйте еще раз.');
+    });
+}
+
+// Функция для обновления профиля из внешних скриптов
+function updateProfileData(userData, balance) {
+    const avatar = document.getElementById('profile-avatar');
+    const username = document.getElementById('profile-username');
+    const mainBalance = document.getElementById('main-balance');
+    
+    if (userData && avatar) {
+        avatar.src = userData.photo_url || '/static/images/default-avatar.png';
+    }
+    
+    if (userData && username) {
+        username.textContent = userData.first_name || 'Пользователь';
+    }
+    
+    if (balance !== undefined && mainBalance) {
+        mainBalance.textContent = balance + ' руб.';
+    }
+}
+
+// Экспортируем функцию для обновления профиля
+window.updateProfileData = updateProfileData;
+
+// Периодическое обновление баланса (каждые 30 секунд)
+setInterval(() => {
+    loadOrders();
+}, 30000);